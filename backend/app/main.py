@@ -1,4 +1,5 @@
 # app/main.py
+import logging
 import os
 from pathlib import Path
 from fastapi import FastAPI
@@ -16,6 +17,13 @@ except ImportError:
     # python-dotenv not installed, skip loading .env file
     pass
 
+# Configure logging once for the whole backend
+# Scraper progress is logged at DEBUG, so it costs nothing unless LOG_LEVEL=DEBUG
+logging.basicConfig(
+    level=os.getenv("LOG_LEVEL", "INFO").upper(),
+    format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+)
+
 app = FastAPI(title="Multi-Website Product Scraper API")
 
 # Configure CORS
@@ -1,16 +1,25 @@
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import Callable, List, Optional
+import os
+import queue
 import time
 import threading
 import uuid
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from scraper.registry import get_scraper, get_available_sites, get_sites_for_brand, get_available_brands
 from scraper.models import Product
+from scraper.browser_pool import browser_pool
 from app.job_store import job_store, JobStatus
 
 router = APIRouter()
 
+# Upper bound on batch workers across all batches and jobs, whatever max_workers clients ask for
+# Each worker keeps its own Chromium open while it holds a slot, so this keeps CPU and memory bounded
+# At least one slot, otherwise every batch would wait forever
+SCRAPE_CONCURRENCY = max(1, int(os.getenv("SCRAPE_CONCURRENCY", "10")))
+scrape_slots = threading.BoundedSemaphore(SCRAPE_CONCURRENCY)
+
 
 @router.get("/search/{site}/{query}", response_model=Product)
 def search(site: str, query: str):
@@ -188,6 +197,59 @@ def scrape_single_product(request: BatchSearchRequest) -> BatchSearchResponse:
     )
 
 
+def run_batch(
+    products: List[BatchSearchRequest],
+    max_workers: int,
+    on_result: Callable[[int, BatchSearchResponse], None],
+) -> None:
+    """
+    Scrape a batch of products on a bounded set of long-lived worker threads.
+    
+    Each worker drains a shared queue until it is empty, so at most max_workers
+    scrapes are in flight however large the batch is, and each worker's browser
+    is reused for every product it processes. Each worker holds one of the process-wide
+    SCRAPE_CONCURRENCY slots while its browser is open, so concurrent batches cannot
+    exceed that many browsers together; extra workers wait for a slot before starting.
+    
+    Slots are held until the queue is drained, not released per product. This is
+    intended: releasing between products would mean closing and relaunching Chromium
+    each time to keep the cap. The trade-off is that a batch which takes every slot
+    makes later batches wait until its workers finish.
+    
+    Args:
+        products: Products to scrape
+        max_workers: Maximum number of products scraped in parallel
+        on_result: Called with (index, result) as each product finishes
+    """
+    pending: "queue.Queue[tuple[int, BatchSearchRequest]]" = queue.Queue()
+    for index, product in enumerate(products):
+        pending.put((index, product))
+    
+    def worker():
+        """Process products from the queue until none are left."""
+        # Hold the slot for the worker's whole lifetime, browser included, so
+        # SCRAPE_CONCURRENCY caps live Chromium processes and not just active scrapes
+        with scrape_slots, browser_pool.session():
+            while True:
+                try:
+                    index, product = pending.get_nowait()
+                except queue.Empty:
+                    return
+                try:
+                    result = scrape_single_product(product)
+                except Exception as e:
+                    result = BatchSearchResponse(
+                        error=f"Unexpected error: {str(e)}", status="error"
+                    )
+                on_result(index, result)
+    
+    num_workers = max(1, min(max_workers, SCRAPE_CONCURRENCY, len(products)))
+    with ThreadPoolExecutor(max_workers=num_workers) as executor:
+        futures = [executor.submit(worker) for _ in range(num_workers)]
+        for future in as_completed(futures):
+            future.result()
+
+
 @router.post("/search/batch", response_model=List[BatchSearchResponse])
 def batch_search(body: BatchSearchRequestBody):
     """
@@ -223,29 +285,10 @@ def batch_search(body: BatchSearchRequestBody):
     results: List[Optional[BatchSearchResponse]] = [None] * len(products)
 
     # Process products in parallel
-    def process_product(index: int, product: BatchSearchRequest) -> tuple[int, BatchSearchResponse]:
-        """Process a single product and return its index and result."""
-        try:
-            result = scrape_single_product(product)
-            return (index, result)
-        except Exception as e:
-            error_result = BatchSearchResponse(
-                error=f"Unexpected error: {str(e)}", status="error"
-            )
-            return (index, error_result)
-
-    # Use ThreadPoolExecutor to process products in parallel
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        # Submit all tasks
-        future_to_index = {
-            executor.submit(process_product, index, product): index
-            for index, product in enumerate(products)
-        }
-        
-        # Collect results as they complete
-        for future in as_completed(future_to_index):
-            index, result = future.result()
-            results[index] = result
+    def store_result(index: int, result: BatchSearchResponse):
+        results[index] = result
+
+    run_batch(products, max_workers, store_result)
 
     # Convert None values to error responses (shouldn't happen, but safety check)
     final_results: List[BatchSearchResponse] = []
@@ -288,33 +331,8 @@ def process_job_async(job_id: str, body: BatchSearchRequestBody):
     job.update_status(JobStatus.IN_PROGRESS)
     
     try:
-        def process_product(index: int, product: BatchSearchRequest):
-            """Process a single product and add result to job store."""
-            try:
-                result = scrape_single_product(product)
-                job.add_result(index, result)
-            except Exception as e:
-                error_result = BatchSearchResponse(
-                    error=f"Unexpected error: {str(e)}", status="error"
-                )
-                job.add_result(index, error_result)
-        
-        # Use ThreadPoolExecutor to process products in parallel
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            # Submit all tasks
-            futures = [
-                executor.submit(process_product, index, product)
-                for index, product in enumerate(products)
-            ]
-            
-            # Wait for all tasks to complete
-            for future in as_completed(futures):
-                try:
-                    future.result()  # This will raise any exceptions that occurred
-                except Exception as e:
-                    # Individual task exceptions are already handled in process_product
-                    # This catch is for executor-level issues
-                    pass
+        # Process products in parallel, adding each result to the job store as it finishes
+        run_batch(products, max_workers, job.add_result)
         
         # Mark job as completed
         job.update_status(JobStatus.COMPLETED)
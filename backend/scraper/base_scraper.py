@@ -1,12 +1,28 @@
 from abc import ABC, abstractmethod
-from playwright.sync_api import Page, sync_playwright
+from functools import lru_cache
+from playwright.sync_api import Locator, Page
+from typing import Optional
+from urllib.parse import urljoin, urlsplit
+import logging
+import re
 import time
+from scraper.browser_pool import browser_pool
 from scraper.models import Product
+from scraper.search_cache import search_cache
+from scraper.services.request_blocking_service import RequestBlockingService
+
+logger = logging.getLogger(__name__)
 
 
 class BaseScraper(ABC):
     """Abstract base class for website-specific scrapers."""
     
+    # Load state that navigations wait for (see Page.goto)
+    wait_until = "load"
+    
+    # Product fields matched by lookup_suggested_product_url (Shopify only searches titles by default)
+    SUGGEST_FIELDS = "title,product_type,vendor,variants.title,variants.sku,variants.barcode"
+    
     @abstractmethod
     def get_base_url(self) -> str:
         """Returns the base URL of the website to scrape."""
@@ -33,57 +49,195 @@ class BaseScraper(ABC):
         """Extracts all product data from the product page."""
         pass
     
+    def prepare_page(self, page: Page) -> None:
+        """Hook for configuring a fresh page before the first navigation.
+        
+        By default skips downloading images, fonts, media and analytics, since scrapers
+        only read HTML text and attributes. Override to register init scripts, routes,
+        viewport settings, etc.; call super() to keep the request blocking.
+        """
+        RequestBlockingService.install(page)
+    
+    def lookup_product_url(self, page: Page, search_text: str) -> Optional[str]:
+        """Hook for resolving the product URL without rendering the search UI.
+        
+        Override to query a search API directly (e.g. with page.request). Returning
+        None falls back to loading the home page and running the UI search.
+        """
+        return None
+    
+    def lookup_suggested_product_url(self, page: Page, suggest_url: str, search_text: str) -> Optional[str]:
+        """
+        Resolves the first product URL from a Shopify predictive search endpoint.
+        Searches titles, variant SKUs and barcodes, so a SKU or EAN finds its product.
+        
+        Args:
+            page: The Playwright page object, whose request context is used
+            suggest_url: The store's /search/suggest.json URL
+            search_text: The search query text
+        
+        Returns:
+            The absolute product URL, or None if the lookup failed or found nothing
+        """
+        logger.debug("Looking up product via search suggestions")
+        try:
+            response = page.request.get(
+                suggest_url,
+                params={
+                    "q": search_text,
+                    "resources[type]": "product",
+                    "resources[limit]": 4,
+                    "resources[options][fields]": self.SUGGEST_FIELDS,
+                },
+                timeout=10000
+            )
+            if not response.ok:
+                logger.warning("Search suggestions returned HTTP %s", response.status)
+                return None
+            products = response.json()["resources"]["results"]["products"]
+        except Exception as e:
+            logger.warning("Could not fetch search suggestions: %s", e)
+            return None
+        
+        if not products:
+            logger.warning("No products in search suggestions")
+            return None
+        
+        product_url = urljoin(self.get_base_url(), products[0]["url"])
+        logger.debug("Product URL: %s", product_url)
+        return product_url
+    
+    def fetch_product_data(self, page: Page, product_url: str) -> Optional[Product]:
+        """Hook for reading product data without rendering the product page.
+        
+        Override to fetch server-rendered HTML or a JSON endpoint (e.g. with page.request)
+        and parse it. Returning None falls back to navigating to the product page and
+        calling extract_product_data.
+        """
+        return None
+    
+    def goto(self, page: Page, url: str) -> None:
+        """Navigates the page to the given URL.
+        
+        Override to add site-specific timeouts or fallback load states.
+        """
+        page.goto(url, wait_until=self.wait_until)
+    
+    def find_product_url(self, page: Page, search_text: str, navigation_delay: float = 0) -> str:
+        """
+        Resolves the URL of the product matching the search text.
+        Tries lookup_product_url first, then falls back to the site's search UI.
+        
+        Args:
+            page: The Playwright page object
+            search_text: The search query text
+            navigation_delay: Delay in seconds between page navigations (default: 0)
+        """
+        product_url = self.lookup_product_url(page, search_text)
+        if product_url:
+            logger.debug("Resolved product URL without the search UI: %s", product_url)
+            return product_url
+        
+        self.goto(page, self.get_base_url())
+        if navigation_delay > 0:
+            time.sleep(navigation_delay)
+        
+        self.perform_search(page, search_text, navigation_delay)
+        
+        return self.get_first_product_link(page, search_text)
+    
     def scrape_product(self, search_text: str, navigation_delay: float = 0) -> Product:
         """
         Main scraping method that orchestrates the entire scraping flow.
-        This method handles browser setup/teardown and calls the abstract methods.
+        This method opens a page from the shared browser pool and calls the abstract methods.
         
         Args:
             search_text: The search query text
             navigation_delay: Delay in seconds between page navigations (default: 0)
         """
-        print(f"Scraping '{search_text}'...")
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=True)
-            page = browser.new_page()
-            
-            page.goto(self.get_base_url(), wait_until="load")
-            if navigation_delay > 0:
-                time.sleep(navigation_delay)
-            
-            self.perform_search(page, search_text, navigation_delay)
-            
-            product_url = self.get_first_product_link(page, search_text)
+        logger.info("Scraping '%s'", search_text)
+        # Pages for the same site share a browser context within a worker's session,
+        # so repeat scrapes reuse the connections warmed up by the first one
+        with browser_pool.new_page(self.get_base_url()) as page:
+            self.prepare_page(page)
             
-            page.goto(product_url)
-            if navigation_delay > 0:
-                time.sleep(navigation_delay)
+            # Repeat scrapes of the same search go straight to the product page
+            base_url = self.get_base_url()
+            product_url = search_cache.get(base_url, search_text)
+            from_cache = product_url is not None
+            if from_cache:
+                logger.debug("Using cached product URL: %s", product_url)
+            else:
+                product_url = self.find_product_url(page, search_text, navigation_delay)
             
-            # Note: Waiting for specific elements is handled in extract_product_data
-            # This matches the original implementation pattern
+            try:
+                product = self.fetch_product_data(page, product_url)
+                if product is None:
+                    self.goto(page, product_url)
+                    if navigation_delay > 0:
+                        time.sleep(navigation_delay)
+                    
+                    # Note: Waiting for specific elements is handled in extract_product_data
+                    # This matches the original implementation pattern
+                    product = self.extract_product_data(page, product_url)
+            except Exception:
+                # The cached page may have moved or been removed, so search again next time
+                if from_cache:
+                    search_cache.invalidate(base_url, search_text)
+                raise
+            search_cache.set(base_url, search_text, product_url)
             
-            product = self.extract_product_data(page, product_url)
-            
-            browser.close()
-            
-            print(f"✓ Scraping completed")
+            logger.info("Scraping completed")
             return product
     
+    @staticmethod
+    def text_or(locator: Locator, default: Optional[str] = "") -> Optional[str]:
+        """
+        Returns the stripped inner text of the locator's first match, or default if
+        nothing matches.
+        
+        Call it after the page's main wait: it reads the DOM as it is, in one
+        round-trip, and returns immediately when the element is absent.
+        
+        Args:
+            locator: Locator for the element to read
+            default: Value returned when no element matches (default: "")
+        """
+        text = locator.evaluate_all("els => els.length ? els[0].innerText : null")
+        return text.strip() if text is not None else default
+    
     @staticmethod
     def clean_image_url(url: str) -> str:
         """Helper method to clean and normalize image URLs."""
         if not url:
             return url
-        # Convert protocol-relative URLs (//) to https://
-        if url.startswith("//"):
-            url = "https:" + url
-        # Remove query parameters to get clean image URL
-        clean_url = url.split("?")[0] if "?" in url else url
-        return clean_url
+        return _clean_image_url(url)
     
     @staticmethod
     def normalize_text(text: str) -> str:
         """Helper method to normalize text by replacing newlines with spaces."""
         if not text:
             return ""
-        return ' '.join(text.split())
+        return _normalize_text(text)
+
+
+# Both helpers are pure functions of their input, so results are memoized:
+# image URLs repeat across galleries and variants, and boilerplate text repeats across products.
+
+@lru_cache(maxsize=1024)
+def _clean_image_url(url: str) -> str:
+    # Convert protocol-relative URLs (//) to https://
+    if url.startswith("//"):
+        url = "https:" + url
+    # Remove query parameters and fragments to get clean image URL,
+    # so e.g. "?v=1" / "?v=2" or "#zoom" variants of one image dedupe to a single entry
+    return urlsplit(url)._replace(query="", fragment="").geturl()
+
+
+# Runs of any whitespace, collapsed to a single space by normalize_text
+_WS_RE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=1024)
+def _normalize_text(text: str) -> str:
+    return _WS_RE.sub(" ", text).strip()
@@ -0,0 +1,141 @@
+"""
+Browser reuse for scrapers.
+Playwright's sync API binds every object to the thread that created it, so each
+worker thread keeps its own Chromium instance and opens cheap contexts on it.
+"""
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+from playwright.sync_api import Browser, BrowserContext, Page, sync_playwright
+
+logger = logging.getLogger(__name__)
+
+
+class BrowserPool:
+    """Hands out pages backed by one long-lived browser per worker thread."""
+    
+    # Shared contexts are recycled after this many pages so cookies, cache and
+    # memory held by a long-running context don't grow without bound
+    MAX_CONTEXT_USES = 50
+    
+    def __init__(self):
+        self._local = threading.local()
+    
+    @contextmanager
+    def session(self) -> Iterator[None]:
+        """
+        Keeps one browser open on the current thread until the block exits.
+        
+        The browser is launched by the first page opened inside the block and every
+        later page on this thread reuses it, so Chromium start-up is paid at most once
+        per worker, and not at all by workers that never get to scrape.
+        Contexts opened by key are closed together with the browser.
+        """
+        if getattr(self._local, "in_session", False):
+            # Already inside a session on this thread
+            yield
+            return
+        
+        self._local.in_session = True
+        self._local.contexts = {}
+        self._local.context_uses = {}
+        try:
+            yield
+        finally:
+            browser = getattr(self._local, "browser", None)
+            playwright = getattr(self._local, "playwright", None)
+            self._local.in_session = False
+            self._local.contexts = {}
+            self._local.context_uses = {}
+            self._local.browser = None
+            self._local.playwright = None
+            if browser is not None:
+                try:
+                    browser.close()
+                finally:
+                    # Stop the driver even if the browser has already died
+                    playwright.stop()
+    
+    def _get_browser(self) -> Browser:
+        """Returns the current thread's session browser, launching it on first use or after a crash."""
+        browser = getattr(self._local, "browser", None)
+        if browser is not None:
+            if browser.is_connected():
+                return browser
+            # Chromium crashed or was killed; its contexts are gone with it, so
+            # relaunch rather than failing every remaining scrape on this thread
+            logger.warning("Browser for thread %s disconnected, relaunching", threading.current_thread().name)
+            playwright = self._local.playwright
+            self._local.browser = None
+            self._local.playwright = None
+            self._local.contexts = {}
+            self._local.context_uses = {}
+            try:
+                playwright.stop()
+            except Exception as e:
+                logger.debug("Could not stop Playwright driver of disconnected browser: %s", e)
+        
+        playwright = sync_playwright().start()
+        try:
+            browser = playwright.chromium.launch(headless=True)
+        except Exception:
+            playwright.stop()
+            raise
+        self._local.playwright = playwright
+        self._local.browser = browser
+        logger.debug("Launched browser for thread %s", threading.current_thread().name)
+        return browser
+    
+    @contextmanager
+    def new_page(self, context_key: Optional[str] = None) -> Iterator[Page]:
+        """
+        Opens a page and closes it afterwards.
+        
+        Inside a session, pages opened with the same context_key share one browser
+        context, so the site's connections, DNS entries and cookies carry over from
+        one scrape to the next. Without a key each page gets a fresh context.
+        
+        Uses the current thread's session browser if there is one; otherwise a
+        browser is launched for this page only.
+        
+        Args:
+            context_key: Optional key (typically the site's base URL) of the context to reuse
+        """
+        if not getattr(self._local, "in_session", False):
+            with self.session():
+                with self.new_page(context_key) as page:
+                    yield page
+            return
+        
+        browser = self._get_browser()
+        
+        if context_key is None:
+            context = browser.new_context()
+            try:
+                yield context.new_page()
+            finally:
+                context.close()
+            return
+        
+        contexts: Dict[str, BrowserContext] = self._local.contexts
+        context_uses: Dict[str, int] = self._local.context_uses
+        context = contexts.get(context_key)
+        if context is not None and context_uses[context_key] >= self.MAX_CONTEXT_USES:
+            logger.debug("Recycling browser context for %s after %d pages", context_key, context_uses[context_key])
+            context.close()
+            context = None
+        if context is None:
+            context = browser.new_context()
+            contexts[context_key] = context
+            context_uses[context_key] = 0
+        context_uses[context_key] += 1
+        page = context.new_page()
+        try:
+            yield page
+        finally:
+            page.close()
+
+
+# Global browser pool instance
+browser_pool = BrowserPool()
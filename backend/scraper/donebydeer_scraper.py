@@ -1,10 +1,12 @@
 from playwright.sync_api import Page
-import time
+import logging
 import re
 from scraper.base_scraper import BaseScraper
 from scraper.models import Product
 from scraper.services.cookie_consent_service import CookieConsentService
 
+logger = logging.getLogger(__name__)
+
 
 class DoneByDeerScraper(BaseScraper):
     """Scraper implementation for donebydeer.com"""
@@ -12,53 +14,49 @@ class DoneByDeerScraper(BaseScraper):
     def get_base_url(self) -> str:
         return "https://donebydeer.com/en-gb"
     
+    def prepare_page(self, page: Page) -> None:
+        """Hides the cookie consent overlay before it ever renders."""
+        super().prepare_page(page)
+        CookieConsentService.suppress(page)
+    
     def perform_search(self, page: Page, search_text: str, navigation_delay: float = 0) -> None:
         """Performs search on Done by Deer website using barcode."""
         # Set desktop viewport to ensure desktop search button is visible
         # Desktop search button is hidden on mobile, so we need desktop viewport
+        # The visibility wait on the search button below covers the CSS re-evaluation
         page.set_viewport_size({"width": 1920, "height": 1080})
-        # Wait for viewport change to take effect and CSS to re-evaluate
-        page.wait_for_timeout(1000)
         
-        # Handle cookie consent overlay if present
-        CookieConsentService.handle(page)
-        
-        print(f"  → Looking for search button...")
+        logger.debug("Looking for search button")
         
         # Find the search button/link in the header
         # The desktop search button is in .header__secondary-links
         search_button = page.locator('.header__secondary-links a[href*="/search"]').first
         search_button.wait_for(state="visible", timeout=5000)
-        print(f"  ✓ Found desktop search button")
+        logger.debug("Found desktop search button")
         
-        print(f"  → Clicking search button to open drawer...")
-        # Ensure button is actionable before clicking
-        search_button.wait_for(state="visible", timeout=5000)
+        logger.debug("Clicking search button to open drawer")
         search_button.click(timeout=10000)
-        print(f"  ✓ Clicked search button")
+        logger.debug("Clicked search button")
         
         # Wait for the search drawer to open
-        print(f"  → Waiting for search drawer to open...")
+        logger.debug("Waiting for search drawer to open")
         search_drawer = page.locator("#search-drawer, predictive-search-drawer#search-drawer")
         search_drawer.wait_for(state="visible", timeout=10000)
-        print(f"  ✓ Search drawer is visible")
+        logger.debug("Search drawer is visible")
         
-        # Wait a bit for drawer animation
-        page.wait_for_timeout(500)
-        
-        # Find and fill the search input
-        print(f"  → Looking for search input...")
+        # Find and fill the search input - waiting for it to be visible covers the drawer animation
+        logger.debug("Looking for search input")
         search_input = page.locator('input[name="q"]').first
         search_input.wait_for(state="visible", timeout=10000)
-        print(f"  ✓ Found search input")
+        logger.debug("Found search input")
         
-        print(f"  → Filling search input with barcode: '{search_text}'...")
+        logger.debug("Filling search input with barcode: '%s'", search_text)
         # Clear and type the barcode to trigger search
         search_input.fill(search_text)
-        print(f"  ✓ Filled search input")
+        logger.debug("Filled search input")
         
         # Wait for the search results to appear
-        print(f"  → Waiting for search results to load...")
+        logger.debug("Waiting for search results to load")
         results_container = page.locator(".predictive-search__results")
         results_container.wait_for(state="visible", timeout=10000)
         
@@ -66,51 +64,42 @@ class DoneByDeerScraper(BaseScraper):
         product_list = page.locator("ul.predictive-search__product-list")
         product_list.wait_for(state="visible", timeout=10000)
         
-        # Wait a bit more for results to populate
-        page.wait_for_timeout(1500)  # Wait for autocomplete/results to load
-        
-        # Wait for actual product items to appear
+        # Wait for actual product items to appear instead of sleeping for the autocomplete
         try:
             product_items = page.locator("li.predictive-search__product-item")
             product_items.first.wait_for(state="visible", timeout=10000)
-            print(f"  ✓ Search results are visible")
+            logger.debug("Search results are visible")
         except:
-            print(f"  ⚠ Search results may not be visible yet, continuing...")
+            logger.warning("Search results may not be visible yet, continuing")
     
     def get_first_product_link(self, page: Page, search_text: str) -> str:
         """Extracts the first product link from Done by Deer search results drawer."""
-        print(f"  → Looking for product links in search results...")
+        logger.debug("Looking for product links in search results")
         
         # Wait for search results container to be visible
         results_container = page.locator(".predictive-search__results")
         results_container.wait_for(state="visible", timeout=15000)
-        print(f"  ✓ Search results container is visible")
+        logger.debug("Search results container is visible")
         
         # Find product links within the search results
         product_links = page.locator("li.predictive-search__product-item a.line-item__content-wrapper")
         
         # Wait for at least one product link to be visible
-        product_links.first.wait_for(state="visible", timeout=15000)
-        print(f"  ✓ Product link is visible")
-        
-        # Count available links to help debug
-        link_count = product_links.count()
-        print(f"  → Found {link_count} product link(s)")
-        
-        print(f"  → Extracting href attribute from first product...")
         first_product = product_links.first
+        first_product.wait_for(state="visible", timeout=15000)
+        logger.debug("Product link is visible")
         
         # Get the product title to verify it's a real product
-        try:
-            product_title_element = first_product.locator(".product-item-meta__title, .line-item__info .product-item-meta__title")
-            if product_title_element.count() > 0:
-                product_title = product_title_element.inner_text().strip()
-                print(f"  → First product title: {product_title[:50]}..." if len(product_title) > 50 else f"  → First product title: {product_title}")
-        except:
-            print(f"  ⚠ Could not extract product title")
+        product_title = self.text_or(first_product.locator(".product-item-meta__title"))
+        if product_title:
+            logger.debug("First product title: %s", product_title)
+        else:
+            logger.warning("Could not extract product title")
+        
+        logger.debug("Extracting href attribute from first product")
         
         href = first_product.get_attribute("href")
-        print(f"  ✓ Got href: {href}")
+        logger.debug("Got href: %s", href)
         
         if not href:
             raise Exception("Product link has no href attribute")
@@ -125,77 +114,60 @@ class DoneByDeerScraper(BaseScraper):
             # If href is relative, construct from base URL
             product_url = f"https://donebydeer.com/en-gb/{href}"
         
-        print(f"  ✓ Product URL: {product_url}")
+        logger.debug("Product URL: %s", product_url)
         return product_url
     
     def extract_product_data(self, page: Page, product_url: str) -> Product:
         """Extracts product data from Done by Deer product page."""
-        print(f"  → Waiting for product title to be visible...")
+        logger.debug("Waiting for product title to be visible")
         title_element = page.locator("h1.product-meta__title")
         title_element.wait_for(state="visible", timeout=15000)
-        print(f"  ✓ Product title is visible")
+        logger.debug("Product title is visible")
         
         # Extract title
-        print(f"  → Extracting product title...")
+        logger.debug("Extracting product title")
         title = title_element.inner_text().strip()
-        print(f"  ✓ Title: {title[:50]}..." if len(title) > 50 else f"  ✓ Title: {title}")
+        logger.debug("Title: %s", title)
         
         # Extract price
-        print(f"  → Extracting product price...")
-        price = ""
-        price_element = page.locator(".price-list .price, .price--large").first
-        if price_element.count() > 0:
-            price = price_element.inner_text().strip()
-            # Remove "Sale price" label if present
-            price = price.replace("Sale price", "").strip()
-            print(f"  ✓ Price: {price}")
+        logger.debug("Extracting product price")
+        # Remove "Sale price" label if present
+        price = self.text_or(page.locator(".price-list .price, .price--large")).replace("Sale price", "").strip()
+        if price:
+            logger.debug("Price: %s", price)
         else:
-            print(f"  ⚠ Price not found")
+            logger.warning("Price not found")
         
         # Extract SKU
-        print(f"  → Extracting product SKU...")
-        sku = ""
-        sku_element = page.locator(".product-meta__sku-number")
-        if sku_element.count() > 0:
-            sku = sku_element.inner_text().strip()
-            print(f"  ✓ SKU: {sku}")
+        logger.debug("Extracting product SKU")
+        sku = self.text_or(page.locator(".product-meta__sku-number"))
+        if sku:
+            logger.debug("SKU: %s", sku)
         else:
-            print(f"  ⚠ SKU not found")
+            logger.warning("SKU not found")
         
         # Extract description
-        print(f"  → Extracting product description...")
-        description = ""
+        logger.debug("Extracting product description")
         # Try to find description in the first tab (Description tab)
         # Look for the first visible tab content with description
-        description_element = page.locator(".product-tabs__tab-item-content.rte").first
-        if description_element.count() > 0:
-            description = description_element.inner_text().strip()
-            description = self.normalize_text(description)
-            print(f"  ✓ Description length: {len(description)} characters")
+        description = self.normalize_text(self.text_or(page.locator(".product-tabs__tab-item-content.rte")))
+        if description:
+            logger.debug("Description length: %d characters", len(description))
         else:
-            print(f"  ⚠ Description not found")
+            logger.warning("Description not found")
         
         # Extract images
-        print(f"  → Extracting product images...")
-        images = []
-        seen_urls = set()
-        
-        # Try to find images in product media section
-        image_elements = page.locator(".product__media-item img, .product__media-image-wrapper img").all()
-        print(f"    Found {len(image_elements)} image element(s)")
+        logger.debug("Extracting product images")
+        # Try to find images in product media section, reading all sources in one call
+        srcs = page.locator(".product__media-item img, .product__media-image-wrapper img").evaluate_all(
+            "els => els.map(el => el.getAttribute('src') || el.getAttribute('data-src'))"
+        )
+        logger.debug("Found %d image element(s)", len(srcs))
         
-        for img in image_elements:
-            src = img.get_attribute("src")
-            if not src:
-                src = img.get_attribute("data-src")
-            if src:
-                clean_url = self.clean_image_url(src)
-                if clean_url and clean_url not in seen_urls:
-                    seen_urls.add(clean_url)
-                    images.append(clean_url)
-                    print(f"      Added image: {clean_url[:60]}...")
+        # Clean and deduplicate image URLs, preserving order
+        images = list(dict.fromkeys(self.clean_image_url(src) for src in srcs if src))
         
-        print(f"  ✓ Found {len(images)} image(s)")
+        logger.debug("Found %d image(s)", len(images))
         
         # Set primary image as the first image (if images exist)
         primary_image = images[0] if images else ""
@@ -204,18 +176,29 @@ class DoneByDeerScraper(BaseScraper):
         specifications = ""
         specs_dict = {}
         
-        def extract_specs_from_html(content_element) -> dict:
-            """Extract key-value pairs from HTML structure using <strong> tags as keys."""
-            result = {}
-            try:
-                # Use JavaScript to extract key-value pairs from the HTML structure
-                # Keys are in <strong> tags, values are text nodes after them
-                html_content = content_element.evaluate("""
-                    (element) => {
-                        const result = {};
-                        const strongTags = element.querySelectorAll('strong');
+        # Extract key-value pairs from the "Good to know" and "Material" tabs in a single pass
+        # Each tab button points at its panel via aria-controls
+        # Keys are in <strong> tags, values are text nodes after them
+        try:
+            logger.debug("Extracting 'Good to know' and 'Material' sections")
+            specs_dict = page.evaluate("""
+                (labels) => {
+                    const result = {};
+                    const buttons = [...document.querySelectorAll('button.tabs-nav__item, button.collapsible-toggle')];
+                    
+                    for (const label of labels) {
+                        const button = buttons.find(b => b.textContent.includes(label));
+                        if (!button) {
+                            continue;
+                        }
+                        // Jump straight from the button to its tab content
+                        const panel = document.getElementById(button.getAttribute('aria-controls'));
+                        const content = panel && panel.querySelector('.product-tabs__tab-item-content.rte, .product-tabs__tab-item-content');
+                        if (!content) {
+                            continue;
+                        }
                         
-                        strongTags.forEach((strong, index) => {
+                        content.querySelectorAll('strong').forEach((strong) => {
                             // Skip if parent has product-meta__sku class (SKU section)
                             const parent = strong.parentElement;
                             if (parent && parent.classList.contains('product-meta__sku')) {
@@ -225,94 +208,49 @@ class DoneByDeerScraper(BaseScraper):
                             const keyText = strong.textContent.trim();
                             
                             // Check if this looks like a key (ends with colon)
-                            if (keyText.endsWith(':')) {
-                                const key = keyText.slice(0, -1).trim();
-                                
-                                // Get value - collect text nodes after this strong tag until next strong
-                                const valueParts = [];
-                                let node = strong.nextSibling;
-                                
-                                while (node) {
-                                    if (node.nodeType === 3) { // Text node
+                            if (!keyText.endsWith(':')) {
+                                return;
+                            }
+                            const key = keyText.slice(0, -1).trim();
+                            
+                            // Get value - collect text nodes after this strong tag until next strong
+                            const valueParts = [];
+                            let node = strong.nextSibling;
+                            
+                            while (node) {
+                                if (node.nodeType === 3) { // Text node
+                                    const text = node.textContent.trim();
+                                    if (text) {
+                                        valueParts.push(text);
+                                    }
+                                } else if (node.nodeType === 1) { // Element node
+                                    if (node.tagName === 'STRONG') {
+                                        break; // Stop at next strong tag
+                                    }
+                                    // Get text content but skip if it contains nested strong tags
+                                    if (!node.querySelector('strong')) {
                                         const text = node.textContent.trim();
                                         if (text) {
                                             valueParts.push(text);
                                         }
-                                    } else if (node.nodeType === 1) { // Element node
-                                        if (node.tagName === 'STRONG' || node.tagName === 'strong') {
-                                            break; // Stop at next strong tag
-                                        }
-                                        // Get text content but skip if it contains nested strong tags
-                                        if (!node.querySelector('strong')) {
-                                            const text = node.textContent.trim();
-                                            if (text) {
-                                                valueParts.push(text);
-                                            }
-                                        }
                                     }
-                                    node = node.nextSibling;
-                                }
-                                
-                                const value = valueParts.join(' ').trim();
-                                if (value) {
-                                    result[key] = value;
                                 }
+                                node = node.nextSibling;
+                            }
+                            
+                            const value = valueParts.join(' ').trim();
+                            if (value) {
+                                result[key] = value;
                             }
                         });
-                        
-                        return result;
                     }
-                """)
-                
-                result = html_content
-            except Exception as e:
-                print(f"    ⚠ Error parsing HTML structure: {str(e)}")
-            
-            return result
-        
-        try:
-            # Extract "Good to know" section
-            print(f"  → Extracting 'Good to know' section...")
-            good_to_know_content = None
-            
-            # Find the tab button with "Good to know" text and get its aria-controls
-            good_to_know_button = page.locator("button.tabs-nav__item, button.collapsible-toggle").filter(has_text="Good to know").first
-            if good_to_know_button.count() > 0:
-                aria_controls = good_to_know_button.get_attribute("aria-controls")
-                if aria_controls:
-                    good_to_know_content = page.locator(f"#{aria_controls} .product-tabs__tab-item-content.rte, #{aria_controls} .product-tabs__tab-item-content").first
-                    if good_to_know_content.count() > 0:
-                        print(f"  ✓ Found 'Good to know' content via aria-controls")
-            
-            # Extract key-value pairs from HTML structure
-            if good_to_know_content and good_to_know_content.count() > 0:
-                parsed = extract_specs_from_html(good_to_know_content)
-                specs_dict.update(parsed)
-                print(f"  ✓ Extracted {len(parsed)} key-value pair(s) from 'Good to know'")
-        except Exception as e:
-            print(f"  ⚠ Error extracting 'Good to know': {str(e)}")
-        
-        try:
-            # Extract Material section (if available)
-            print(f"  → Extracting 'Material' section...")
-            material_content = None
-            
-            # Find the tab button with "Material" text and get its aria-controls
-            material_button = page.locator("button.tabs-nav__item, button.collapsible-toggle").filter(has_text="Material").first
-            if material_button.count() > 0:
-                aria_controls = material_button.get_attribute("aria-controls")
-                if aria_controls:
-                    material_content = page.locator(f"#{aria_controls} .product-tabs__tab-item-content.rte, #{aria_controls} .product-tabs__tab-item-content").first
-                    if material_content.count() > 0:
-                        print(f"  ✓ Found 'Material' content via aria-controls")
-            
-            # Extract key-value pairs from Material HTML structure
-            if material_content and material_content.count() > 0:
-                material_parsed = extract_specs_from_html(material_content)
-                specs_dict.update(material_parsed)
-                print(f"  ✓ Extracted {len(material_parsed)} key-value pair(s) from Material section")
+                    
+                    return result;
+                }
+            """, ["Good to know", "Material"])
+            logger.debug("Extracted %d key-value pair(s) from specification tabs", len(specs_dict))
         except Exception as e:
-            print(f"  ⚠ Error extracting 'Material': {str(e)}")
+            logger.warning("Error extracting specification tabs: %s", e)
         
         # Format specifications as key-value pairs separated by newlines
         # Format: "Key: Value\nKey2: Value2"
@@ -327,9 +265,9 @@ class DoneByDeerScraper(BaseScraper):
                 # Format as "Key: Value"
                 specs_lines.append(f"{key}: {value}")
             specifications = "\n".join(specs_lines)
-            print(f"  ✓ Formatted {len(specs_dict)} specification(s)")
+            logger.debug("Formatted %d specification(s)", len(specs_dict))
         else:
-            print(f"  ⚠ No specifications found")
+            logger.warning("No specifications found")
         
         return Product(
             title=title,
@@ -1,71 +1,105 @@
-from playwright.sync_api import Page
+from playwright.sync_api import Page, TimeoutError as PlaywrightTimeoutError
+import logging
 from scraper.base_scraper import BaseScraper
 from scraper.models import Product
 
+logger = logging.getLogger(__name__)
+
 
 class HapeGlobalScraper(BaseScraper):
     """Scraper implementation for global.hape.com"""
     
+    # The search button and product title waits are the real readiness signals
+    wait_until = "domcontentloaded"
+    
+    SEARCH_INPUT_SELECTOR = "#offcanvas-search-content #header-main-search-input, #offcanvas-search-content input[type='search']"
+    SEARCH_LISTBOX_SELECTOR = "#search-suggest-listbox"
+    PRODUCT_LINK_SELECTOR = "li.search-suggest-product a.search-suggest-product-link"
+    TITLE_SELECTOR = "h1.product-detail-name"
+    
+    # Specification rows that duplicate other Product fields
+    SKIPPED_SPEC_FIELDS = frozenset(["title", "barcode", "category", "quantity", "product number", "productnumber", "numri i produktit"])
+    
+    # Title, price, description, SKU, gallery images and Specifications accordion rows
+    EXTRACT_SCRIPT = """
+        () => {
+            const text = (el) => el ? el.innerText.trim() : '';
+            
+            // Specifications accordion: each item has two spans, key and value
+            const specs = [];
+            const specsAccordion = [...document.querySelectorAll('.description-accordion-item')]
+                .find(item => item.textContent.toLowerCase().includes('specifications'));
+            const specsContainer = specsAccordion && specsAccordion.querySelector('.description-accordion-content-items');
+            if (specsContainer) {
+                specsContainer.querySelectorAll('.description-accordion-content-item').forEach((item) => {
+                    const spans = item.querySelectorAll('span');
+                    if (spans.length >= 2) {
+                        specs.push([text(spans[0]), text(spans[1])]);
+                    }
+                });
+            }
+            
+            return {
+                title: text(document.querySelector('h1.product-detail-name')),
+                // Use first if multiple prices exist
+                price: text(document.querySelector('p.product-detail-price, span.product-price')),
+                description: text(document.querySelector('.description-accordion-content-description-text')),
+                specs: specs,
+                sku: text(document.querySelector('span.description-accordion-content-ordernumber')),
+                // Gallery slider images, src first then data-src
+                images: [...document.querySelectorAll('.gallery-slider-image[src], .gallery-slider-image[data-src]')]
+                    .map(img => img.getAttribute('src') || img.getAttribute('data-src')),
+            };
+        }
+    """
+    
     def get_base_url(self) -> str:
         return "https://global.hape.com/"
     
     def perform_search(self, page: Page, search_text: str, navigation_delay: float = 0) -> None:
         """Performs search on Hape website."""
-        print(f"  Searching for '{search_text}'...")
+        logger.debug("Searching for '%s'", search_text)
         search_button = page.locator("button.header-action-search").first
         search_button.wait_for(state="visible", timeout=10000)
         search_button.click()
         offcanvas = page.locator("#offcanvas-search-content")
         offcanvas.wait_for(state="visible", timeout=10000)
-        search_input = page.locator("#offcanvas-search-content #header-main-search-input, #offcanvas-search-content input[type='search']").first
+        search_input = page.locator(self.SEARCH_INPUT_SELECTOR).first
         search_input.wait_for(state="visible", timeout=10000)
-        search_input.clear()
-        # Type character by character to trigger the autocomplete dropdown
-        search_input.type(search_text, delay=100)
-        
-        current_value = search_input.input_value()
-        
-        # If the text wasn't fully entered, try filling it directly
-        if current_value != search_text:
-            search_input.fill("")  # Clear first
-            page.wait_for_timeout(100)
-            search_input.fill(search_text)
-            page.wait_for_timeout(200)
-            current_value = search_input.input_value()
+        # fill() sets the whole value at once and fires the input event the autocomplete listens for
+        search_input.fill(search_text)
         
         # Wait for the listbox to appear - this is more specific than the container
-        search_listbox = page.locator("#search-suggest-listbox")
+        search_listbox = page.locator(self.SEARCH_LISTBOX_SELECTOR)
         search_listbox.wait_for(state="visible", timeout=10000)
         
-        # Wait for debounce period (typically 300-500ms for autocomplete)
-        # Then wait a bit more to ensure results have updated for the full search text
-        page.wait_for_timeout(800)
-        
-        # Wait for results to stabilize - check that we have product links
-        product_links = page.locator("li.search-suggest-product a.search-suggest-product-link")
+        # Wait for product links instead of sleeping through the autocomplete debounce
+        # fill() sets the full query at once, so no partial-query results can show up first
+        product_links = page.locator(self.PRODUCT_LINK_SELECTOR)
         try:
             product_links.first.wait_for(state="visible", timeout=5000)
-        except Exception as e:
-            # Wait a bit more in case results are still loading
-            page.wait_for_timeout(500)
+        except PlaywrightTimeoutError:
+            logger.warning("Search suggestions may not be visible yet, continuing")
         
-        print(f"  ✓ Search completed")
+        logger.debug("Search completed")
     
     def get_first_product_link(self, page: Page, search_text: str) -> str:
         """Extracts the first product link from Hape search results dropdown."""
-        # Wait for the listbox to be visible and have items
-        search_listbox = page.locator("#search-suggest-listbox")
-        search_listbox.wait_for(state="visible", timeout=10000)
-        product_links = page.locator("li.search-suggest-product a.search-suggest-product-link")
-        product_links.first.wait_for(state="visible", timeout=10000)
-        link_count = product_links.count()
-        
-        if link_count == 0:
+        # Poll the DOM until the first suggestion link exists and hand back its href in the same call
+        try:
+            href_handle = page.wait_for_function(
+                """
+                    (selector) => {
+                        const link = document.querySelector(selector);
+                        return link && link.getAttribute('href');
+                    }
+                """,
+                arg=self.PRODUCT_LINK_SELECTOR,
+                timeout=15000
+            )
+        except PlaywrightTimeoutError:
             raise Exception("No product links found in search suggest dropdown")
-        
-        first_product = product_links.first
-        first_product.wait_for(state="visible", timeout=15000)
-        href = first_product.get_attribute("href")
+        href = href_handle.json_value()
         
         if href and href.startswith("http"):
             product_url = href
@@ -77,86 +111,28 @@ class HapeGlobalScraper(BaseScraper):
     
     def extract_product_data(self, page: Page, product_url: str) -> Product:
         """Extracts product data from Hape product page."""
-        print(f"  Extracting product data...")
-        title_element = page.locator("h1.product-detail-name")
+        logger.debug("Extracting product data")
+        title_element = page.locator(self.TITLE_SELECTOR)
         title_element.wait_for(state="visible", timeout=15000)
         
-        # Extract title
-        title = page.locator("h1.product-detail-name").inner_text().strip()
-        
-        # Extract price - use first if multiple prices exist
-        price_elements = page.locator("p.product-detail-price, span.product-price")
-        price_count = price_elements.count()
-        if price_count > 0:
-            price = price_elements.first.inner_text().strip()
-        else:
-            price = ""
-        
-        # Extract description from description accordion
-        description = ""
-        specifications = ""
+        data = page.evaluate(self.EXTRACT_SCRIPT)
         
-        # Look for description in the description accordion
-        description_el = page.locator(".description-accordion-content-description-text")
-        description_count = description_el.count()
-        if description_count > 0:
-            description = description_el.first.inner_text().strip()
-            description = self.normalize_text(description)
-        
-        # Extract Specifications section
-        try:
-            # Find the Specifications accordion by looking for accordion with "Specifications" text
-            specs_accordion = page.locator(".description-accordion-item").filter(has_text="Specifications")
-            specs_count = specs_accordion.count()
-            if specs_count > 0:
-                # Find the container with specification items
-                specs_items_container = specs_accordion.first.locator(".description-accordion-content-items")
-                if specs_items_container.count() > 0:
-                    # Get all specification items
-                    spec_items = specs_items_container.first.locator(".description-accordion-content-item").all()
-                    
-                    spec_lines = []
-                    for item in spec_items:
-                        # Each item has two spans: key and value
-                        spans = item.locator("span").all()
-                        if len(spans) >= 2:
-                            key = spans[0].inner_text().strip()
-                            value = spans[1].inner_text().strip()
-                            # Skip Title, Barcode, Category, Quantity, and Product number fields as they're redundant
-                            key_lower = key.lower()
-                            skip_fields = ["title", "barcode", "category", "quantity", "product number", "productnumber", "numri i produktit"]
-                            if key and value and key_lower not in skip_fields:
-                                spec_lines.append(f"{key}: {value}")
-                    
-                    if spec_lines:
-                        specifications = "\n".join(spec_lines)
-                        # Don't normalize specifications - preserve newlines for proper parsing
-        except Exception:
-            pass
-        
-        # Extract SKU from product meta
-        sku_el = page.locator("span.description-accordion-content-ordernumber")
-        sku_count = sku_el.count()
-        if sku_count > 0:
-            sku = sku_el.first.inner_text().strip()
-        else:
-            sku = ""
+        title = data["title"]
+        price = data["price"]
+        description = self.normalize_text(data["description"])
+        sku = data["sku"]
         
-        # Extract images from gallery slider
-        image_elements = page.locator(".gallery-slider-image[src], .gallery-slider-image[data-src]").all()
-        images = []
-        seen_urls = set()
+        # Skip Title, Barcode, Category, Quantity, and Product number fields as they're redundant
+        spec_lines = [
+            f"{key}: {value}"
+            for key, value in data["specs"]
+            if key and value and key.lower() not in self.SKIPPED_SPEC_FIELDS
+        ]
+        # Don't normalize specifications - preserve newlines for proper parsing
+        specifications = "\n".join(spec_lines)
         
-        for i, img in enumerate(image_elements, 1):
-            # Try src first, then data-src
-            src = img.get_attribute("src")
-            if not src:
-                src = img.get_attribute("data-src")
-            if src:
-                clean_url = self.clean_image_url(src)
-                if clean_url not in seen_urls:
-                    seen_urls.add(clean_url)
-                    images.append(clean_url)
+        # Clean and deduplicate image URLs, preserving order
+        images = list(dict.fromkeys(self.clean_image_url(src) for src in data["images"] if src))
         
         # Set primary image as the first image (if images exist)
         primary_image = images[0] if images else ""
@@ -172,5 +148,5 @@ class HapeGlobalScraper(BaseScraper):
             url=product_url
         )
         
-        print(f"  ✓ Product extracted")
+        logger.debug("Product extracted")
         return product
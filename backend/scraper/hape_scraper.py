@@ -1,131 +1,143 @@
-from playwright.sync_api import Page
+from playwright.sync_api import Page, TimeoutError as PlaywrightTimeoutError
+import re
+import logging
 from scraper.base_scraper import BaseScraper
 from scraper.models import Product
 
+logger = logging.getLogger(__name__)
+
 
 class HapeScraper(BaseScraper):
     """Scraper implementation for toys.hape.com"""
     
+    # Only DOM text and attributes are read, so there is no need to wait for subresources
+    wait_until = "domcontentloaded"
+    
+    SEARCH_INPUT_SELECTOR = "input[type='search']"
+    PRODUCT_LINK_SELECTOR = 'a[href*="/products/"]'
+    TITLE_SELECTOR = "h1.product-detail__title"
+    
+    # Description lines that carry specification data when there is no Features list
+    SPEC_LINE_RE = re.compile(r"^.*(?:Item Weight|Product Dimensions|Adult Assembly Required|Warning):.*$", re.MULTILINE)
+    
+    # Title, price, SKU, images, and the Description block's text and Features list
+    EXTRACT_SCRIPT = """
+        () => {
+            const text = (el) => el ? el.innerText.trim() : '';
+            const result = {
+                title: text(document.querySelector('h1.product-detail__title')),
+                price: text(document.querySelector('span.price.price-same-style.heading-style')),
+                description: '',
+                features: '',
+                sku: text(document.querySelector('span.product__sku')),
+                images: [...document.querySelectorAll('media-gallery .media-gallery__image img')]
+                    .map(img => img.getAttribute('src')),
+            };
+            
+            // Find the collapsible-block with the "Description" heading
+            for (const block of document.querySelectorAll('collapsible-block')) {
+                if (!text(block.querySelector('h3.collapsible-heading')).includes('Description')) {
+                    continue;
+                }
+                const content = block.querySelector('div.collapsible-content_inner.product_description');
+                if (content) {
+                    result.description = text(content);
+                    // Features section is the list following the "Features" heading
+                    // Match on the heading's full string value so "Features" wrapped in a span still counts
+                    const features = document.evaluate(
+                        ".//h2[contains(., 'Features')]/following-sibling::ul[1]",
+                        content, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null
+                    ).singleNodeValue;
+                    result.features = text(features);
+                }
+                break;
+            }
+            
+            return result;
+        }
+    """
+    
     def get_base_url(self) -> str:
         return "https://toys.hape.com/"
     
     def perform_search(self, page: Page, search_text: str, navigation_delay: float = 0) -> None:
         """Performs search on Hape website."""
-        print(f"  → Looking for search input...")
-        search_input = page.locator("input[type='search']")
-        print(f"  ✓ Found search input")
-        print(f"  → Filling search input with: '{search_text}'...")
+        logger.debug("Filling search input with: '%s'", search_text)
+        search_input = page.locator(self.SEARCH_INPUT_SELECTOR)
         search_input.fill(search_text)
-        print(f"  ✓ Filled search input")
-        print(f"  → Pressing Enter to submit search...")
         search_input.press("Enter")
-        print(f"  ✓ Search submitted")
+        logger.debug("Search submitted")
     
     def get_first_product_link(self, page: Page, search_text: str) -> str:
         """Extracts the first product link from Hape search results."""
-        print(f"  → Looking for product links in search results...")
-        first_product = page.locator('a[href*="/products/"]').first
-        print(f"  → Waiting for first product link to be visible...")
-        first_product.wait_for(state="visible", timeout=15000)
-        print(f"  ✓ Product link is visible")
-        print(f"  → Extracting href attribute...")
-        href = first_product.get_attribute("href")
-        print(f"  ✓ Got href: {href}")
-        product_url = f"https://toys.hape.com{href}"
-        print(f"  ✓ Product URL: {product_url}")
+        logger.debug("Waiting for first product link in search results")
+        # Poll until the first product link exists and return its resolved, absolute href in the same call
+        try:
+            href_handle = page.wait_for_function(
+                """
+                    (selector) => {
+                        const link = document.querySelector(selector);
+                        return link && link.href;
+                    }
+                """,
+                arg=self.PRODUCT_LINK_SELECTOR,
+                timeout=15000
+            )
+        except PlaywrightTimeoutError:
+            raise Exception("No product links found in search results")
+        product_url = href_handle.json_value()
+        logger.debug("Product URL: %s", product_url)
         return product_url
     
     def extract_product_data(self, page: Page, product_url: str) -> Product:
         """Extracts product data from Hape product page."""
-        print(f"  → Waiting for product title to be visible...")
-        title_element = page.locator("h1.product-detail__title")
+        logger.debug("Waiting for product title to be visible")
+        title_element = page.locator(self.TITLE_SELECTOR)
         title_element.wait_for(state="visible", timeout=15000)
-        print(f"  ✓ Product title is visible")
         
-        # Extract title
-        print(f"  → Extracting product title...")
-        title = page.locator("h1.product-detail__title").inner_text().strip()
-        print(f"  ✓ Title: {title[:50]}..." if len(title) > 50 else f"  ✓ Title: {title}")
+        logger.debug("Extracting product fields")
+        data = page.evaluate(self.EXTRACT_SCRIPT)
+        
+        title = data["title"]
+        logger.debug("Title: %s", title)
         
-        # Extract price - use first if multiple prices exist
-        print(f"  → Extracting product price...")
-        price = page.locator("span.price.price-same-style.heading-style").first.inner_text().strip()
-        print(f"  ✓ Price: {price}")
+        price = data["price"]
+        logger.debug("Price: %s", price)
         
-        # Extract description from collapsible-block with "Description" heading
-        print(f"  → Extracting product description...")
+        # Description and specifications come from the "Description" collapsible-block
         description = ""
         specifications = ""
-        description_blocks = page.locator("collapsible-block").all()
-        print(f"    Found {len(description_blocks)} collapsible block(s)")
-        for block in description_blocks:
-            heading = block.locator("h3.collapsible-heading").inner_text().strip()
-            print(f"    Checking block with heading: {heading}")
-            if "Description" in heading:
-                print(f"  ✓ Found Description block")
-                content_el = block.locator("div.collapsible-content_inner.product_description")
-                if content_el.count() > 0:
-                    full_text = content_el.inner_text().strip()
-                    print(f"    Description length: {len(full_text)} characters")
-                    
-                    # Extract Features section as specifications
-                    print(f"    → Looking for Features section...")
-                    try:
-                        features_ul = content_el.locator("xpath=.//h2[contains(text(), 'Features')]/following-sibling::ul[1]")
-                        if features_ul.count() > 0:
-                            specs_text = features_ul.inner_text().strip()
-                            specifications = self.normalize_text(specs_text)
-                            print(f"  ✓ Found Features section")
-                            print(f"    Specifications length: {len(specifications)} characters")
-                    except:
-                        print(f"    ⚠ Features section not found")
-                    
-                    # If Features not found, try to extract specification data from text
-                    if not specifications:
-                        print(f"    → Extracting specifications from text...")
-                        spec_lines = []
-                        lines = full_text.split('\n')
-                        for line in lines:
-                            line = line.strip()
-                            if any(keyword in line for keyword in ['Item Weight:', 'Product Dimensions:', 'Adult Assembly Required:', 'Warning:']):
-                                spec_lines.append(line)
-                        if spec_lines:
-                            specifications = ' '.join(spec_lines)
-                            print(f"  ✓ Extracted specifications from text")
-                            print(f"    Specifications length: {len(specifications)} characters")
-                    
-                    description = self.normalize_text(full_text)
-                break
+        full_text = data["description"]
+        if full_text:
+            logger.debug("Description length: %d characters", len(full_text))
+            
+            # Extract Features section as specifications
+            if data["features"]:
+                specifications = self.normalize_text(data["features"])
+                logger.debug("Specifications from Features section, length: %d characters", len(specifications))
+            
+            # If Features not found, try to extract specification data from text
+            if not specifications:
+                spec_lines = [match.group(0).strip() for match in self.SPEC_LINE_RE.finditer(full_text)]
+                if spec_lines:
+                    specifications = ' '.join(spec_lines)
+                    logger.debug("Specifications from description text, length: %d characters", len(specifications))
+            
+            description = self.normalize_text(full_text)
         
         if not description:
-            print(f"  ⚠ Description not found")
+            logger.warning("Description not found")
         
-        # Extract SKU from product meta
-        print(f"  → Extracting product SKU...")
-        sku_el = page.locator("span.product__sku")
-        sku = sku_el.inner_text().strip() if sku_el.count() > 0 else ""
+        sku = data["sku"]
         if sku:
-            print(f"  ✓ SKU: {sku}")
+            logger.debug("SKU: %s", sku)
         else:
-            print(f"  ⚠ SKU not found")
-        
-        # Extract images from media-gallery
-        print(f"  → Extracting product images...")
-        image_elements = page.locator("media-gallery .media-gallery__image img").all()
-        print(f"    Found {len(image_elements)} image element(s)")
-        images = []
-        seen_urls = set()
+            logger.warning("SKU not found")
         
-        for img in image_elements:
-            src = img.get_attribute("src")
-            if src:
-                clean_url = self.clean_image_url(src)
-                if clean_url not in seen_urls:
-                    seen_urls.add(clean_url)
-                    images.append(clean_url)
-                    print(f"      Added image: {clean_url[:60]}...")
+        # Clean and deduplicate image URLs, preserving order
+        images = list(dict.fromkeys(self.clean_image_url(src) for src in data["images"] if src))
         
-        print(f"  ✓ Found {len(images)} image(s)")
+        logger.debug("Found %d image(s)", len(images))
         
         # Set primary image as the first image (if images exist)
         primary_image = images[0] if images else ""
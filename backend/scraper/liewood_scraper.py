@@ -1,88 +1,111 @@
-from playwright.sync_api import Page
+from playwright.sync_api import Page, TimeoutError as PlaywrightTimeoutError
+from typing import Optional
+from html import unescape
 import time
 import json
 import re
+import logging
+from bs4 import BeautifulSoup
 from scraper.base_scraper import BaseScraper
 from scraper.models import Product
-from scraper.services.cookie_consent_service import CookieConsentService
+from scraper.services.request_blocking_service import RequestBlockingService
+
+logger = logging.getLogger(__name__)
 
 
 class LiewoodScraper(BaseScraper):
     """Scraper implementation for liewood.com"""
     
+    # The search result and product info waits are the real readiness signals
+    wait_until = "domcontentloaded"
+    
+    # Search results page: the product panel, its cards and each card's link
+    SEARCH_PANEL_SELECTOR = "#main-search-results-product"
+    PRODUCT_CARD_SELECTOR = "product-card, .product-card"
+    # The media link and the title link point at the same product, so a single union covers both
+    PRODUCT_LINK_SELECTOR = "a.product-card__media, .product-card__media a, a.product-title, .product-title a"
+    
+    # HTML tags in the product JSON description
+    TAG_RE = re.compile(r"<[^>]+>")
+    
+    # Shopify predictive search endpoint, queried directly to skip the search results page
+    SUGGEST_URL = "https://www.liewood.com/search/suggest.json"
+    
+    # Marketing pixels common on Shopify storefronts, on top of the default analytics hosts
+    BLOCKED_HOSTS = RequestBlockingService.DEFAULT_BLOCKED_HOSTS + [
+        "klaviyo.com",
+        "tiktok.com",
+        "pinterest.com",
+        "bing.com",
+    ]
+    
     def get_base_url(self) -> str:
         return "https://www.liewood.com"
     
+    def prepare_page(self, page: Page) -> None:
+        """Also skips marketing scripts. Stylesheets stay, as the search waits check visibility."""
+        RequestBlockingService.install(page, blocked_hosts=self.BLOCKED_HOSTS)
+    
+    def lookup_product_url(self, page: Page, search_text: str) -> Optional[str]:
+        """Resolves the first product URL from LieWood's predictive search JSON."""
+        return self.lookup_suggested_product_url(page, self.SUGGEST_URL, search_text)
+    
     def perform_search(self, page: Page, search_text: str, navigation_delay: float = 0) -> None:
         """Performs search on LieWood website by navigating directly to search URL with product name."""
-        print(f"  → Navigating to search URL with product name: '{search_text}'...")
+        logger.debug("Navigating to search URL with product name: '%s'", search_text)
         
         # Navigate directly to search URL with product name as query parameter
         search_url = f"{self.get_base_url()}/search?q={search_text}"
-        page.goto(search_url, wait_until="load")
+        self.goto(page, search_url)
         
         if navigation_delay > 0:
             time.sleep(navigation_delay)
         
         # Wait for search results to load
-        print(f"  → Waiting for search results to load...")
+        logger.debug("Waiting for search results to load")
         
         # Wait for product search result panel specifically (not pages or articles)
         # The product panel has id="main-search-results-product"
-        product_result_panel = page.locator('#main-search-results-product')
+        product_result_panel = page.locator(self.SEARCH_PANEL_SELECTOR)
         product_result_panel.wait_for(state="visible", timeout=15000)
-        print(f"  ✓ Product search results container is visible")
+        logger.debug("Product search results container is visible")
         
         # Wait for at least one product card to appear within the product panel
-        product_cards = product_result_panel.locator("product-card, .product-card")
+        product_cards = product_result_panel.locator(self.PRODUCT_CARD_SELECTOR)
         try:
             product_cards.first.wait_for(state="visible", timeout=15000)
-            print(f"  ✓ Product cards are visible")
+            logger.debug("Product cards are visible")
         except Exception as e:
-            print(f"  ⚠ No products found in search results: {str(e)}")
+            logger.warning("No products found in search results: %s", e)
             raise Exception(f"No products found for product name: {search_text}")
     
     def get_first_product_link(self, page: Page, search_text: str) -> str:
         """Extracts the first product link from LieWood search results."""
-        print(f"  → Looking for product links in search results...")
-        
-        # Wait for product search result panel specifically
-        product_result_panel = page.locator('#main-search-results-product')
-        product_result_panel.wait_for(state="visible", timeout=15000)
-        
-        # Wait for product list to be visible within the product panel
-        product_list = product_result_panel.locator("product-list, .product-list")
-        product_list.wait_for(state="visible", timeout=15000)
+        logger.debug("Looking for product links in search results")
         
-        # Find the first product card within the product panel
-        first_product_card = product_result_panel.locator("product-card, .product-card").first
-        first_product_card.wait_for(state="visible", timeout=15000)
-        print(f"  ✓ Found first product card")
-        
-        # Try to find product link - check product-card__media link
-        product_link = None
-        
-        # Try product-card__media link first
-        media_link = first_product_card.locator("a.product-card__media, .product-card__media a").first
-        if media_link.count() > 0:
-            product_link = media_link
-            print(f"  → Found product link via product-card__media")
-        else:
-            # Try product-title link as fallback
-            title_link = first_product_card.locator("a.product-title, .product-title a").first
-            if title_link.count() > 0:
-                product_link = title_link
-                print(f"  → Found product link via product-title")
-        
-        if not product_link or product_link.count() == 0:
+        # perform_search already waited for the product panel and its cards, so poll until the
+        # first card's link carries an href and hand it back in the same call
+        try:
+            href_handle = page.wait_for_function(
+                """
+                    (selectors) => {
+                        const panel = document.querySelector(selectors.panel);
+                        const card = panel && panel.querySelector(selectors.card);
+                        const link = card && card.querySelector(selectors.link);
+                        return link && link.getAttribute('href');
+                    }
+                """,
+                arg={
+                    "panel": self.SEARCH_PANEL_SELECTOR,
+                    "card": self.PRODUCT_CARD_SELECTOR,
+                    "link": self.PRODUCT_LINK_SELECTOR,
+                },
+                timeout=5000
+            )
+        except PlaywrightTimeoutError:
             raise Exception("No product link found in search results")
-        
-        # Extract href attribute
-        href = product_link.get_attribute("href")
-        print(f"  ✓ Got href: {href}")
-        
-        if not href:
-            raise Exception("Product link has no href attribute")
+        href = href_handle.json_value()
+        logger.debug("Got href: %s", href)
         
         # Construct full URL if needed
         if href.startswith("http"):
@@ -92,35 +115,60 @@ class LiewoodScraper(BaseScraper):
         else:
             product_url = f"{self.get_base_url()}/{href}"
         
-        print(f"  ✓ Product URL: {product_url}")
+        logger.debug("Product URL: %s", product_url)
         return product_url
     
     def extract_product_data(self, page: Page, product_url: str) -> Product:
         """Extracts product data from LieWood product page."""
-        print(f"  → Extracting product data...")
-        
-        # Handle cookie consent overlay if present
-        CookieConsentService.handle(page)
+        logger.debug("Extracting product data")
         
         # Wait for product page to load
-        print(f"  → Waiting for product page to load...")
+        logger.debug("Waiting for product page to load")
         product_info = page.locator(".product-info, product-rerender").first
         product_info.wait_for(state="attached", timeout=15000)
-        print(f"  ✓ Product page loaded")
+        logger.debug("Product page loaded")
+        
+        # Same parser as the HTTP path, run on the rendered DOM
+        return self._parse_product(page.content(), product_url)
+    
+    def fetch_product_data(self, page: Page, product_url: str) -> Optional[Product]:
+        """Reads the server-rendered product page over HTTP, skipping the browser render."""
+        logger.debug("Fetching product page HTML")
+        try:
+            response = page.request.get(product_url, timeout=15000)
+            if not response.ok:
+                logger.warning("Product page returned HTTP %s, rendering it instead", response.status)
+                return None
+            return self._parse_product(response.text(), product_url, require_product_markup=True)
+        except Exception as e:
+            logger.warning("Could not read product page HTML, rendering it instead: %s", e)
+            return None
+    
+    def _parse_product(self, html: str, product_url: str, require_product_markup: bool = False) -> Optional[Product]:
+        """
+        Parses a product page's HTML into a Product.
+        
+        Args:
+            html: The product page HTML
+            product_url: URL of the product page
+            require_product_markup: Return None unless the title comes from the product JSON or
+                ProductMeta__Title, e.g. for unrendered HTML that may be a challenge or listing page
+        """
+        # Collapsed accordion content is still in the markup, so nothing needs expanding
+        soup = BeautifulSoup(html, "lxml")
         
         # Try to get product data from JSON script tag first (more reliable)
         product_json = None
-        json_script = page.locator('script#product-json[type="application/json"]').first
-        if json_script.count() > 0:
+        json_script = soup.select_one('script#product-json[type="application/json"]')
+        if json_script:
             try:
-                json_text = json_script.inner_text()
-                product_json = json.loads(json_text)
-                print(f"  ✓ Found product JSON data")
+                product_json = json.loads(json_script.get_text())
+                logger.debug("Found product JSON data")
             except Exception as e:
-                print(f"  ⚠ Could not parse product JSON: {str(e)}")
+                logger.warning("Could not parse product JSON: %s", e)
         
         # Extract title
-        print(f"  → Extracting product title...")
+        logger.debug("Extracting product title")
         title = ""
         
         # Try from JSON first
@@ -129,45 +177,50 @@ class LiewoodScraper(BaseScraper):
             # Remove color variant from title if present (format: "Product Name - Color variant")
             if " - " in title:
                 title = title.split(" - ")[0].strip()
-            print(f"  ✓ Title from JSON: {title[:50]}..." if len(title) > 50 else f"  ✓ Title from JSON: {title}")
+            logger.debug("Title from JSON: %s", title)
         
         # Fallback to HTML elements
         if not title:
             # Try ProductMeta__Title
-            title_element = page.locator("h1.ProductMeta__Title, .ProductMeta__Title").first
-            if title_element.count() > 0:
-                title_text = title_element.inner_text().strip()
+            title_element = soup.select_one("h1.ProductMeta__Title, .ProductMeta__Title")
+            if title_element:
+                title_text = self.normalize_text(title_element.get_text(" "))
                 # Extract just the product name (before color variant)
                 if " - " in title_text:
                     title = title_text.split(" - ")[0].strip()
                 else:
                     title = title_text
-                print(f"  ✓ Title from ProductMeta__Title: {title[:50]}..." if len(title) > 50 else f"  ✓ Title: {title}")
+                logger.debug("Title from ProductMeta__Title: %s", title)
+        
+        if not title and require_product_markup:
+            # .product-title also appears on cards and other non-product pages
+            logger.warning("No product JSON or ProductMeta__Title in page HTML, rendering it instead")
+            return None
         
         if not title:
             # Try product-title span
-            title_span = page.locator("span.product-title.h6, .product-title").first
-            if title_span.count() > 0:
-                title = title_span.inner_text().strip()
-                print(f"  ✓ Title from product-title span: {title[:50]}..." if len(title) > 50 else f"  ✓ Title: {title}")
+            title_span = soup.select_one("span.product-title.h6, .product-title")
+            if title_span:
+                title = self.normalize_text(title_span.get_text(" "))
+                logger.debug("Title from product-title span: %s", title)
         
         if not title:
             raise Exception("Product title not found")
         
         # Extract price
-        print(f"  → Extracting product price...")
+        logger.debug("Extracting product price")
         price = ""
-        price_element = page.locator("sale-price, .price-list sale-price").first
-        if price_element.count() > 0:
-            price_text = price_element.inner_text().strip()
+        price_element = soup.select_one("sale-price, .price-list sale-price")
+        if price_element:
+            price_text = self.normalize_text(price_element.get_text(" "))
             # Remove "Sale price" label if present
             price = re.sub(r"Sale price\s*", "", price_text, flags=re.IGNORECASE).strip()
-            print(f"  ✓ Price: {price}")
+            logger.debug("Price: %s", price)
         else:
-            print(f"  ⚠ Price not found")
+            logger.warning("Price not found")
         
         # Extract SKU
-        print(f"  → Extracting product SKU...")
+        logger.debug("Extracting product SKU")
         sku = ""
         
         # Try from JSON first
@@ -175,125 +228,76 @@ class LiewoodScraper(BaseScraper):
             variant = product_json["variants"][0]
             if "sku" in variant:
                 sku = variant["sku"].strip()
-                print(f"  ✓ SKU from JSON: {sku}")
+                logger.debug("SKU from JSON: %s", sku)
         
         # Fallback to HTML element
         if not sku:
-            sku_element = page.locator("variant-sku, .variant-sku").first
-            if sku_element.count() > 0:
-                sku_text = sku_element.inner_text().strip()
+            sku_element = soup.select_one("variant-sku, .variant-sku")
+            if sku_element:
+                sku_text = self.normalize_text(sku_element.get_text(" "))
                 # Extract SKU from text like "SKU: LW14569\9883\ONE SIZE"
                 if "SKU:" in sku_text:
                     sku = sku_text.split("SKU:")[1].strip()
                 else:
                     sku = sku_text
-                print(f"  ✓ SKU from variant-sku: {sku}")
+                logger.debug("SKU from variant-sku: %s", sku)
         
         if not sku:
-            print(f"  ⚠ SKU not found")
+            logger.warning("SKU not found")
         
         # Extract description
-        print(f"  → Extracting product description...")
+        logger.debug("Extracting product description")
         description = ""
         
-        # Try to find and expand DESCRIPTION accordion if needed
-        description_accordion = page.locator('accordion-disclosure:has(summary:has-text("DESCRIPTION"))').first
-        if description_accordion.count() > 0:
-            # Check if accordion is open
-            details = description_accordion.locator("details").first
-            if details.count() > 0:
-                is_open = details.get_attribute("open")
-                if not is_open:
-                    # Try to expand using JavaScript to avoid cookie overlay blocking
-                    try:
-                        page.evaluate("""
-                            (() => {
-                                const accordion = document.querySelector('accordion-disclosure:has(summary:has-text("DESCRIPTION"))');
-                                if (accordion) {
-                                    const details = accordion.querySelector('details');
-                                    if (details && !details.hasAttribute('open')) {
-                                        details.setAttribute('open', '');
-                                        return true;
-                                    }
-                                }
-                                return false;
-                            })();
-                        """)
-                        page.wait_for_timeout(500)
-                        print(f"  → Expanded DESCRIPTION accordion via JavaScript")
-                    except Exception as e:
-                        print(f"  ⚠ Could not expand accordion via JavaScript: {str(e)}")
-                        # Fallback: try clicking (may fail if overlay is still blocking)
-                        try:
-                            summary = details.locator("summary").first
-                            if summary.count() > 0:
-                                summary.click(timeout=5000)
-                                page.wait_for_timeout(500)
-                                print(f"  → Expanded DESCRIPTION accordion via click")
-                        except Exception as e2:
-                            print(f"  ⚠ Could not expand accordion via click: {str(e2)}")
-            
-            # Extract description text
-            description_element = description_accordion.locator(".accordion__content.prose, .accordion__content").first
-            if description_element.count() > 0:
-                description = description_element.inner_text().strip()
-                description = self.normalize_text(description)
-                print(f"  ✓ Description length: {len(description)} characters")
+        # Find the accordion whose summary reads "DESCRIPTION" (the label is upper-cased by CSS)
+        for accordion in soup.select("accordion-disclosure"):
+            summary = accordion.select_one("summary")
+            if not summary or "description" not in summary.get_text().lower():
+                continue
+            description_element = accordion.select_one(".accordion__content.prose, .accordion__content")
+            if description_element:
+                description = self.normalize_text(description_element.get_text(" "))
+                logger.debug("Description length: %d characters", len(description))
+            break
         
         # If no description from accordion, try from JSON
         if not description and product_json and "description" in product_json:
             description = product_json["description"].strip()
-            # Remove HTML tags if present
-            description = re.sub(r"<[^>]+>", "", description)
+            # Remove HTML tags if present, keeping words in adjacent elements apart, then decode entities
+            description = unescape(self.TAG_RE.sub(" ", description))
             description = self.normalize_text(description)
-            print(f"  ✓ Description from JSON, length: {len(description)} characters")
+            logger.debug("Description from JSON, length: %d characters", len(description))
         
         if not description:
-            print(f"  ⚠ Description not found")
+            logger.warning("Description not found")
         
         # Extract specifications
-        print(f"  → Extracting product specifications...")
+        logger.debug("Extracting product specifications")
         specifications = ""
         
         # LieWood website does not have a separate specifications section
         # All product information is in the description
         # Return empty specifications to avoid extracting footer/legal text
-        print(f"  ✓ No specifications section available (information is in description)")
+        logger.debug("No specifications section available (information is in description)")
         
         # Extract images
-        print(f"  → Extracting product images...")
-        images = []
-        seen_urls = set()
-        
-        # Try from JSON first (more reliable)
-        if product_json and "images" in product_json:
-            for image_url in product_json["images"]:
-                if image_url:
-                    clean_url = self.clean_image_url(image_url)
-                    if clean_url and clean_url not in seen_urls:
-                        seen_urls.add(clean_url)
-                        images.append(clean_url)
-                        print(f"      Added image from JSON: {clean_url[:60]}...")
+        logger.debug("Extracting product images")
+        # Try from JSON first (more reliable); clean and deduplicate, preserving order
+        srcs = product_json.get("images", []) if product_json else []
+        images = list(dict.fromkeys(self.clean_image_url(src) for src in srcs if src))
         
         # Fallback to HTML elements
         if not images:
-            # Extract from product gallery images
-            image_elements = page.locator("product-gallery img, .product-gallery img, .product-gallery__media img").all()
-            print(f"    Found {len(image_elements)} image element(s)")
+            # Extract from product gallery images, src first then data-src
+            srcs = [
+                img.get("src") or img.get("data-src")
+                for img in soup.select("product-gallery img, .product-gallery img, .product-gallery__media img")
+            ]
+            logger.debug("Found %d image element(s)", len(srcs))
             
-            for img in image_elements:
-                src = img.get_attribute("src")
-                if not src:
-                    src = img.get_attribute("data-src")
-                
-                if src:
-                    clean_url = self.clean_image_url(src)
-                    if clean_url and clean_url not in seen_urls:
-                        seen_urls.add(clean_url)
-                        images.append(clean_url)
-                        print(f"      Added image: {clean_url[:60]}...")
-        
-        print(f"  ✓ Found {len(images)} image(s)")
+            images = list(dict.fromkeys(self.clean_image_url(src) for src in srcs if src))
+        
+        logger.debug("Found %d image(s)", len(images))
         
         # Set primary image as the first image (if images exist)
         primary_image = images[0] if images else ""
@@ -1,122 +1,88 @@
-from playwright.sync_api import Page, sync_playwright
-import time
+from playwright.sync_api import Page
+import logging
 from scraper.base_scraper import BaseScraper
 from scraper.models import Product
 
+logger = logging.getLogger(__name__)
+
 
 class RockahulaScraper(BaseScraper):
     """Scraper implementation for www.rockahulakids.com"""
     
+    # "domcontentloaded" is faster than "load" and sufficient for our needs
+    wait_until = "domcontentloaded"
+    
     def get_base_url(self) -> str:
         return "https://www.rockahulakids.com/"
     
-    def scrape_product(self, search_text: str, navigation_delay: float = 0) -> Product:
+    def goto(self, page: Page, url: str) -> None:
         """
-        Override scrape_product to add longer timeout for bulk scraping.
+        Navigates with a longer timeout and progressively less strict load states for bulk scraping.
         """
-        print(f"Scraping '{search_text}'...")
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=True)
-            page = browser.new_page()
-            
-            # Use longer timeout and less strict wait strategy for initial page load
-            # "domcontentloaded" is faster than "load" and sufficient for our needs
-            try:
-                page.goto(self.get_base_url(), wait_until="domcontentloaded", timeout=60000)
-            except Exception as e:
-                # If domcontentloaded times out, try with networkidle
-                print(f"  ⚠ Initial load with domcontentloaded timed out, trying networkidle...")
-                try:
-                    page.goto(self.get_base_url(), wait_until="networkidle", timeout=60000)
-                except Exception as e2:
-                    # Last resort: just wait for commit
-                    print(f"  ⚠ Networkidle also timed out, using commit...")
-                    page.goto(self.get_base_url(), wait_until="commit", timeout=60000)
-                    # Wait a bit for page to be interactive
-                    page.wait_for_load_state("domcontentloaded", timeout=30000)
-            
-            if navigation_delay > 0:
-                time.sleep(navigation_delay)
-            
-            self.perform_search(page, search_text, navigation_delay)
-            
-            product_url = self.get_first_product_link(page, search_text)
-            
-            # Use longer timeout for product page as well
+        try:
+            page.goto(url, wait_until=self.wait_until, timeout=60000)
+        except Exception:
+            # If domcontentloaded times out, try with networkidle
+            logger.warning("Load with domcontentloaded timed out, trying networkidle")
             try:
-                page.goto(product_url, wait_until="domcontentloaded", timeout=60000)
-            except Exception as e:
-                print(f"  ⚠ Product page load timed out, trying networkidle...")
-                try:
-                    page.goto(product_url, wait_until="networkidle", timeout=60000)
-                except Exception as e2:
-                    print(f"  ⚠ Networkidle also timed out, using commit...")
-                    page.goto(product_url, wait_until="commit", timeout=60000)
-                    page.wait_for_load_state("domcontentloaded", timeout=30000)
-            
-            if navigation_delay > 0:
-                time.sleep(navigation_delay)
-            
-            product = self.extract_product_data(page, product_url)
-            
-            browser.close()
-            
-            print(f"✓ Scraping completed")
-            return product
+                page.goto(url, wait_until="networkidle", timeout=60000)
+            except Exception:
+                # Last resort: just wait for commit
+                logger.warning("Networkidle also timed out, using commit")
+                page.goto(url, wait_until="commit", timeout=60000)
+                # Wait a bit for page to be interactive
+                page.wait_for_load_state("domcontentloaded", timeout=30000)
     
     def perform_search(self, page: Page, search_text: str, navigation_delay: float = 0) -> None:
         """Performs search on Rockahula website."""
-        print(f"  → Looking for search button...")
+        logger.debug("Looking for search button")
         # Find the search icon/link in the header
         search_button = page.locator("div.t4s-site-nav__search > a, a[href='/search']").first
         search_button.wait_for(state="visible", timeout=10000)
-        print(f"  ✓ Found search button")
+        logger.debug("Found search button")
         
-        print(f"  → Clicking search button to open drawer...")
+        logger.debug("Clicking search button to open drawer")
         search_button.click()
-        print(f"  ✓ Clicked search button")
+        logger.debug("Clicked search button")
         
         # Wait for the search drawer to open
-        print(f"  → Waiting for search drawer to open...")
+        logger.debug("Waiting for search drawer to open")
         search_drawer = page.locator("#t4s-search-hidden")
         search_drawer.wait_for(state="visible", timeout=10000)
-        print(f"  ✓ Search drawer is visible")
+        logger.debug("Search drawer is visible")
         
         # Find and fill the search input
-        print(f"  → Looking for search input...")
+        logger.debug("Looking for search input")
         search_input = page.locator("input[data-input-search], input.t4s-mini-search__input").first
         search_input.wait_for(state="visible", timeout=10000)
-        print(f"  ✓ Found search input")
+        logger.debug("Found search input")
         
-        print(f"  → Filling search input with: '{search_text}'...")
+        logger.debug("Filling search input with: '%s'", search_text)
         # Type the search text to trigger autocomplete
         search_input.fill(search_text)
-        print(f"  ✓ Filled search input")
+        logger.debug("Filled search input")
         
         # Wait for the search results container to appear
-        print(f"  → Waiting for search results to load...")
+        logger.debug("Waiting for search results to load")
         results_container = page.locator("div[data-results-search], div.t4s-mini-search__content")
         results_container.wait_for(state="visible", timeout=10000)
         
-        # Wait a bit more for results to populate
-        page.wait_for_timeout(1500)  # Wait for autocomplete/results to load
-        
-        # Wait for actual product results (widget__pr) to appear
+        # Wait for actual product results (widget__pr) to appear instead of sleeping for the autocomplete
         try:
             product_results = page.locator("div.t4s-widget__pr")
             product_results.first.wait_for(state="visible", timeout=10000)
-            print(f"  ✓ Search results are visible")
+            logger.debug("Search results are visible")
         except:
-            print(f"  ⚠ Search results may not be visible yet, continuing...")
+            logger.warning("Search results may not be visible yet, continuing")
     
     def get_first_product_link(self, page: Page, search_text: str) -> str:
         """Extracts the first product link from Rockahula search results."""
-        print(f"  → Looking for product links in search results...")
+        logger.debug("Looking for product links in search results")
         
         # Wait for search results container to be visible
         results_container = page.locator("div[data-results-search], div.t4s-mini-search__content")
         results_container.wait_for(state="visible", timeout=15000)
-        print(f"  ✓ Search results container is visible")
+        logger.debug("Search results container is visible")
         
         # Find product links within the search results - use the title link which is the main product link
         # This should be the actual product, not gift cards or other non-product items
@@ -125,40 +91,40 @@ class RockahulaScraper(BaseScraper):
         
         # If no title links found, fall back to any product link in widget__pr within results
         if product_links.count() == 0:
-            print(f"  → No title links found, trying alternative selector...")
+            logger.debug("No title links found, trying alternative selector")
             product_links = results_container.locator("div.t4s-widget__pr a[href*='/products/']")
         
         # Wait for at least one product link to be visible
         product_links.first.wait_for(state="visible", timeout=15000)
-        print(f"  ✓ Product link is visible")
+        logger.debug("Product link is visible")
         
         # Count available links to help debug
         link_count = product_links.count()
-        print(f"  → Found {link_count} product link(s)")
+        logger.debug("Found %s product link(s)", link_count)
         
-        print(f"  → Extracting href attribute from first product...")
+        logger.debug("Extracting href attribute from first product")
         first_product = product_links.first
         
         # Get the product title to verify it's a real product (not a gift card)
         try:
             product_title = first_product.inner_text().strip()
-            print(f"  → First product title: {product_title}")
+            logger.debug("First product title: %s", product_title)
         except:
             product_title = ""
-            print(f"  ⚠ Could not extract product title")
+            logger.warning("Could not extract product title")
         
         # Filter out gift cards if they appear first
         if product_title and "gift" in product_title.lower() and link_count > 1:
-            print(f"  ⚠ First result is a gift card, trying next product...")
+            logger.warning("First result is a gift card, trying next product")
             first_product = product_links.nth(1)
             try:
                 product_title = first_product.inner_text().strip()
-                print(f"  → Using second product: {product_title}")
+                logger.debug("Using second product: %s", product_title)
             except:
-                print(f"  ⚠ Could not extract second product title")
+                logger.warning("Could not extract second product title")
         
         href = first_product.get_attribute("href")
-        print(f"  ✓ Got href: {href}")
+        logger.debug("Got href: %s", href)
         
         # Construct full URL if needed
         if href and href.startswith("http"):
@@ -169,96 +135,75 @@ class RockahulaScraper(BaseScraper):
             # If href is relative, construct from base URL
             product_url = f"https://www.rockahulakids.com/{href}"
         
-        print(f"  ✓ Product URL: {product_url}")
+        logger.debug("Product URL: %s", product_url)
         return product_url
     
     def extract_product_data(self, page: Page, product_url: str) -> Product:
         """Extracts product data from Rockahula product page."""
-        print(f"  → Waiting for product title to be visible...")
+        logger.debug("Waiting for product title to be visible")
         title_element = page.locator("h1.t4s-product__title")
         title_element.wait_for(state="visible", timeout=15000)
-        print(f"  ✓ Product title is visible")
+        logger.debug("Product title is visible")
         
         # Extract title
-        print(f"  → Extracting product title...")
+        logger.debug("Extracting product title")
         title = title_element.inner_text().strip()
-        print(f"  ✓ Title: {title[:50]}..." if len(title) > 50 else f"  ✓ Title: {title}")
+        logger.debug("Title: %s", title)
         
         # Extract price
-        print(f"  → Extracting product price...")
-        price_element = page.locator("div.t4s-product-price span.money").first
-        price = price_element.inner_text().strip() if price_element.count() > 0 else ""
+        logger.debug("Extracting product price")
+        price = self.text_or(page.locator("div.t4s-product-price span.money"))
         if price:
-            print(f"  ✓ Price: {price}")
+            logger.debug("Price: %s", price)
         else:
-            print(f"  ⚠ Price not found")
+            logger.warning("Price not found")
         
         # Extract SKU - it's in a span with class t4s-sku-value, and the text is after "Style: "
-        print(f"  → Extracting product SKU...")
-        sku = ""
-        sku_element = page.locator("span.t4s-productMeta__value.t4s-sku-value, span.t4s-sku-value")
-        if sku_element.count() > 0:
-            sku = sku_element.inner_text().strip()
-            print(f"  ✓ SKU: {sku}")
+        logger.debug("Extracting product SKU")
+        sku = self.text_or(page.locator("span.t4s-productMeta__value.t4s-sku-value, span.t4s-sku-value"))
+        if sku:
+            logger.debug("SKU: %s", sku)
         else:
             # Try to find SKU in the product meta section
-            sku_wrapper = page.locator("div.t4s-sku-wrapper")
-            if sku_wrapper.count() > 0:
-                sku_text = sku_wrapper.inner_text().strip()
-                # Extract SKU after "Style: "
-                if "Style:" in sku_text:
-                    sku = sku_text.split("Style:")[-1].strip()
-                    print(f"  ✓ SKU: {sku}")
-                else:
-                    print(f"  ⚠ SKU not found in expected format")
+            sku_text = self.text_or(page.locator("div.t4s-sku-wrapper"))
+            if not sku_text:
+                logger.warning("SKU not found")
+            # Extract SKU after "Style: "
+            elif "Style:" in sku_text:
+                sku = sku_text.split("Style:")[-1].strip()
+                logger.debug("SKU: %s", sku)
             else:
-                print(f"  ⚠ SKU not found")
+                logger.warning("SKU not found in expected format")
         
         # Extract description
-        print(f"  → Extracting product description...")
-        description = ""
-        description_element = page.locator("div.t4s-product__description.t4s-rte")
-        if description_element.count() > 0:
-            description = description_element.inner_text().strip()
-            description = self.normalize_text(description)
-            print(f"  ✓ Description length: {len(description)} characters")
+        logger.debug("Extracting product description")
+        description = self.normalize_text(self.text_or(page.locator("div.t4s-product__description.t4s-rte")))
+        if description:
+            logger.debug("Description length: %d characters", len(description))
         else:
-            print(f"  ⚠ Description not found")
+            logger.warning("Description not found")
         
         # Extract images
-        print(f"  → Extracting product images...")
-        images = []
-        seen_urls = set()
-        
-        # Try to find images with data-master attribute first
-        image_elements = page.locator("img[data-master]").all()
-        print(f"    Found {len(image_elements)} image(s) with data-master attribute")
+        logger.debug("Extracting product images")
+        # Try to find images with data-master attribute first, reading every attribute in one call
+        srcs = page.eval_on_selector_all("img[data-master]", "els => els.map(el => el.getAttribute('data-master'))")
+        logger.debug("Found %d image(s) with data-master attribute", len(srcs))
         
-        for img in image_elements:
-            src = img.get_attribute("data-master")
-            if src:
-                clean_url = self.clean_image_url(src)
-                if clean_url and clean_url not in seen_urls:
-                    seen_urls.add(clean_url)
-                    images.append(clean_url)
-                    print(f"      Added image: {clean_url[:60]}...")
+        # Clean and deduplicate image URLs, preserving order
+        images = list(dict.fromkeys(self.clean_image_url(src) for src in srcs if src))
         
         # If no images found with data-master, try regular img tags in product media section
         if not images:
-            print(f"    → Trying alternative image selectors...")
-            image_elements = page.locator("div[data-product-single-media-wrapper] img, div.t4s-product__media img").all()
-            print(f"    Found {len(image_elements)} image element(s)")
+            logger.debug("Trying alternative image selectors")
+            srcs = page.eval_on_selector_all(
+                "div[data-product-single-media-wrapper] img, div.t4s-product__media img",
+                "els => els.map(el => el.getAttribute('src') || el.getAttribute('data-src'))"
+            )
+            logger.debug("Found %d image element(s)", len(srcs))
             
-            for img in image_elements:
-                src = img.get_attribute("src") or img.get_attribute("data-src")
-                if src:
-                    clean_url = self.clean_image_url(src)
-                    if clean_url and clean_url not in seen_urls:
-                        seen_urls.add(clean_url)
-                        images.append(clean_url)
-                        print(f"      Added image: {clean_url[:60]}...")
+            images = list(dict.fromkeys(self.clean_image_url(src) for src in srcs if src))
         
-        print(f"  ✓ Found {len(images)} image(s)")
+        logger.debug("Found %d image(s)", len(images))
         
         # Set primary image as the first image (if images exist)
         primary_image = images[0] if images else ""
@@ -0,0 +1,57 @@
+"""
+Cache of search lookups for scrapers.
+Thread-safe in-memory mapping of a site's search text to the product URL it resolved to,
+so re-scraping a product skips the home page and search UI.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+
+class SearchCache:
+    """Bounded, time-limited cache of (base URL, search text) -> product URL."""
+    
+    def __init__(self, max_size: int = 1024, ttl_seconds: int = 3600):
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+    
+    @staticmethod
+    def _key(base_url: str, search_text: str) -> Tuple[str, str]:
+        """Normalize the search text so casing and spacing differences share an entry."""
+        return base_url, " ".join(search_text.split()).lower()
+    
+    def get(self, base_url: str, search_text: str) -> Optional[str]:
+        """Return the cached product URL, or None if missing or expired."""
+        key = self._key(base_url, search_text)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, product_url = entry
+            if time.time() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return product_url
+    
+    def set(self, base_url: str, search_text: str, product_url: str):
+        """Store a product URL, evicting the least recently used entries beyond max_size."""
+        key = self._key(base_url, search_text)
+        with self._lock:
+            self._entries[key] = (time.time(), product_url)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+    
+    def invalidate(self, base_url: str, search_text: str):
+        """Forget a cached product URL, e.g. after its page failed to scrape."""
+        key = self._key(base_url, search_text)
+        with self._lock:
+            self._entries.pop(key, None)
+
+
+# Global search cache instance
+search_cache = SearchCache()
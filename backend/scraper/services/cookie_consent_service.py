@@ -1,6 +1,9 @@
+import logging
 from typing import Optional, List
 from playwright.sync_api import Page
 
+logger = logging.getLogger(__name__)
+
 
 class CookieConsentService:
     """Service for handling cookie consent overlays on web pages."""
@@ -12,6 +15,31 @@ class CookieConsentService:
         "#cookie-information-template-wrapper"
     ]
     
+    @staticmethod
+    def suppress(page: Page, custom_selectors: Optional[List[str]] = None) -> None:
+        """
+        Registers an init script that hides cookie consent overlays before they render.
+        
+        Must be called before the first navigation. The injected stylesheet applies to
+        every document loaded in the page, so there is no overlay to detect or dismiss
+        afterwards.
+        
+        Args:
+            page: The Playwright page object
+            custom_selectors: Optional list of custom CSS selectors for site-specific overlays.
+                            If not provided, uses default common selectors.
+        """
+        selectors = custom_selectors if custom_selectors else CookieConsentService.DEFAULT_SELECTORS
+        selector_string = ", ".join(selectors)
+        
+        page.add_init_script(f"""
+            document.addEventListener('DOMContentLoaded', () => {{
+                const style = document.createElement('style');
+                style.textContent = '{selector_string} {{ display: none !important; pointer-events: none !important; }}';
+                document.head.appendChild(style);
+            }});
+        """)
+    
     @staticmethod
     def handle(page: Page, custom_selectors: Optional[List[str]] = None) -> None:
         """
@@ -31,16 +59,16 @@ class CookieConsentService:
         # Combine selectors into a single locator string
         selector_string = ", ".join(selectors)
         
-        print(f"  → Checking for cookie consent overlay...")
+        logger.debug("Checking for cookie consent overlay")
         cookie_overlay = page.locator(selector_string)
         
         if cookie_overlay.count() > 0:
             try:
                 # Wait for overlay to be visible
                 cookie_overlay.first.wait_for(state="visible", timeout=3000)
-                print(f"  → Cookie overlay detected, dismissing...")
+                logger.debug("Cookie overlay detected, dismissing")
             except Exception as e:
-                print(f"  ⚠ Cookie overlay handling failed: {str(e)}")
+                logger.warning("Cookie overlay handling failed: %s", e)
             finally:
                 # Force hide overlay programmatically (this is the only method that actually works)
                 try:
@@ -56,6 +84,6 @@ class CookieConsentService:
                         }});
                     """)
                     page.wait_for_timeout(500)
-                    print(f"  ✓ Hid cookie overlay programmatically")
+                    logger.debug("Hid cookie overlay programmatically")
                 except Exception as e:
-                    print(f"  ⚠ Failed to hide cookie overlay via JavaScript: {str(e)}")
+                    logger.warning("Failed to hide cookie overlay via JavaScript: %s", e)
@@ -0,0 +1,68 @@
+import logging
+from typing import Optional, List
+from urllib.parse import urlsplit
+from playwright.sync_api import Page, Route
+
+logger = logging.getLogger(__name__)
+
+
+class RequestBlockingService:
+    """Service for aborting requests for resources that scrapers never read."""
+    
+    # Default resource types to block
+    # Image URLs are still read from src/data-src attributes in the HTML, so the bytes are never needed
+    DEFAULT_RESOURCE_TYPES = [
+        "image",
+        "font",
+        "media",
+    ]
+    
+    # Default third-party hosts to block (subdomains included)
+    # Analytics, ads and tracking scripts never affect the content that is scraped
+    DEFAULT_BLOCKED_HOSTS = [
+        "google-analytics.com",
+        "googletagmanager.com",
+        "doubleclick.net",
+        "facebook.net",
+        "facebook.com",
+        "hotjar.com",
+        "segment.com",
+        "segment.io",
+    ]
+    
+    @staticmethod
+    def install(
+        page: Page,
+        resource_types: Optional[List[str]] = None,
+        blocked_hosts: Optional[List[str]] = None
+    ) -> None:
+        """
+        Aborts every request for the given resource types or to the given hosts on the page.
+        
+        Must be called before the first navigation. Stylesheets are not blocked by
+        default because visibility-based waits depend on the page's CSS.
+        
+        Args:
+            page: The Playwright page object
+            resource_types: Optional list of Playwright resource types to block.
+                          If not provided, uses the default resource types.
+            blocked_hosts: Optional list of hostnames to block, including their subdomains.
+                          If not provided, uses the default hosts; pass [] to block none.
+        """
+        blocked_types = frozenset(resource_types if resource_types else RequestBlockingService.DEFAULT_RESOURCE_TYPES)
+        hosts = tuple(blocked_hosts if blocked_hosts is not None else RequestBlockingService.DEFAULT_BLOCKED_HOSTS)
+        host_suffixes = tuple("." + host for host in hosts)
+        
+        def is_blocked_host(url: str) -> bool:
+            hostname = urlsplit(url).hostname or ""
+            return hostname in hosts or hostname.endswith(host_suffixes)
+        
+        def handle_route(route: Route) -> None:
+            request = route.request
+            if request.resource_type in blocked_types or is_blocked_host(request.url):
+                route.abort()
+            else:
+                route.continue_()
+        
+        page.route("**/*", handle_route)
+        logger.debug("Blocking resource types: %s; hosts: %s", ", ".join(sorted(blocked_types)), ", ".join(hosts))